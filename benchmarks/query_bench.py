@@ -0,0 +1,142 @@
+"""
+Benchmark filtered history queries on a large synthetic history.
+
+Populates a temporary database, then times each filter combination and
+checks its query plan: filters must be resolved through an index, and
+results must come back in index order without a temporary sort.
+
+    python benchmarks/query_bench.py --rows 500000
+"""
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List, Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from clipkeeper import ClipboardManager
+
+def setup_logging():
+    """Configure basic logging."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+
+def populate(manager: ClipboardManager, rows: int, days: int, seed: int):
+    """Insert `rows` synthetic items spread evenly over the last `days` days."""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    span = timedelta(days=days).total_seconds()
+
+    def generate():
+        for i in range(rows):
+            is_image = rng.random() < 0.2
+            size = rng.randint(1000, 20000) if is_image else rng.randint(10, 2000)
+            content = f"{i:08d}" + ("i" if is_image else "t") * size
+            timestamp = now - timedelta(seconds=span * (rows - i) / rows)
+            yield (
+                content,
+                "image" if is_image else "text",
+                timestamp.strftime('%Y-%m-%d %H:%M:%S'),
+                f"bench-{i}",
+                len(content)
+            )
+
+    with manager._get_db_connection() as conn:
+        conn.executemany(
+            """
+            INSERT INTO clipboard_history (content, content_type, timestamp, hash, size)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            generate()
+        )
+
+def query_plan(manager: ClipboardManager, sql: str, params: List) -> List[str]:
+    with manager._get_db_connection() as conn:
+        return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+def check_plan(plan: List[str]) -> bool:
+    """True if the plan reads the table only through an index, without sorting."""
+    for step in plan:
+        if step.startswith("SCAN clipboard_history") and "USING" not in step:
+            return False
+        if "TEMP B-TREE" in step:
+            return False
+    return True
+
+def run(args: argparse.Namespace) -> List[Dict]:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "bench.db")
+        # Queries never touch the clipboard, so no platform handler is needed
+        manager = ClipboardManager(db_path=db_path, clipboard=object())
+        return run_cases(manager, args)
+
+def run_cases(manager: ClipboardManager, args: argparse.Namespace) -> List[Dict]:
+    started = time.perf_counter()
+    populate(manager, args.rows, args.days, args.seed)
+    logging.info(f"Inserted {args.rows} rows in {time.perf_counter() - started:.1f}s")
+
+    now = datetime.now(timezone.utc)
+    yesterday = now - timedelta(days=1)
+    cases = {
+        'latest': {},
+        'images': {'content_type': 'image'},
+        'images_yesterday': {'content_type': 'image', 'since': yesterday - timedelta(days=1), 'until': yesterday},
+        'last_hour': {'since': now - timedelta(hours=1)},
+        'large_text_week': {'content_type': 'text', 'since': now - timedelta(days=7), 'min_size': 1500},
+        'small_items': {'max_size': 50},
+    }
+
+    results = []
+    for name, filters in cases.items():
+        sql, params = manager._history_query(args.limit, **filters)
+        plan = query_plan(manager, sql, params)
+
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            items = manager.get_history(limit=args.limit, **filters)
+            timings.append(time.perf_counter() - start)
+
+        results.append({
+            'name': name,
+            'rows': len(items),
+            'best_ms': round(min(timings) * 1000, 2),
+            'indexed': check_plan(plan),
+            'plan': plan,
+        })
+    return results
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Clipkeeper filtered query benchmark")
+    parser.add_argument('--rows', type=int, default=200000, help='Synthetic history size')
+    parser.add_argument('--days', type=int, default=90, help='Days of history to spread rows over')
+    parser.add_argument('--limit', type=int, default=50, help='Items fetched per query')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per query')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    setup_logging()
+    results = run(args)
+
+    print(f"{'query':<20} {'rows':>5} {'best ms':>9}  indexed")
+    for result in results:
+        print(f"{result['name']:<20} {result['rows']:>5} {result['best_ms']:>9}  {result['indexed']}")
+        for step in result['plan']:
+            print(f"{'':<22}{step}")
+
+    if not all(result['indexed'] for result in results):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,372 @@
+"""
+Load and soak test harness for Clipkeeper.
+
+Drives a ClipboardManager with a simulated clipboard and connects real
+Socket.IO clients to a WebInterface, measuring the latency from a clipboard
+change to client receipt along with database growth, process memory and
+dropped or duplicated events. Runs headless on any platform:
+
+    python benchmarks/soak.py --rate 5 --clients 10 --duration 3600
+
+The Socket.IO clients need python-socketio's client extras
+(`pip install "python-socketio[client]"`).
+"""
+import argparse
+import base64
+import json
+import logging
+import os
+import random
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Optional, List, Dict, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from clipkeeper import ClipboardManager, WebInterface
+from clipkeeper.core.clipboard import ClipboardContent, ClipboardFormat
+
+MARKER_PREFIX = "clip-"
+# "clip-<8 hex run id>-<8 digit sequence>"
+MARKER_LENGTH = len(MARKER_PREFIX) + 8 + 1 + 8
+
+def setup_logging():
+    """Configure basic logging."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+    # Keep per-request access logs out of the report
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+
+def parse_size_mix(spec: str) -> List[Tuple[int, float]]:
+    """Parse 'size:weight,...' into (size, weight) pairs."""
+    mix = []
+    for part in spec.split(','):
+        size, _, weight = part.partition(':')
+        mix.append((int(size), float(weight or 1)))
+    return mix
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of `values`, or None if empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+def current_rss() -> int:
+    """Resident set size of this process in bytes."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def extract_marker(content) -> Optional[str]:
+    if isinstance(content, str) and content.startswith(MARKER_PREFIX):
+        return content[:MARKER_LENGTH]
+    return None
+
+class SimulatedClipboard:
+    """In-memory stand-in for WindowsClipboard."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._content = None
+        self._format = ClipboardFormat.UNKNOWN
+
+    def set_content(self, content: str, fmt: ClipboardFormat):
+        with self._lock:
+            self._content = content
+            self._format = fmt
+
+    def _read(self, fmt: ClipboardFormat) -> ClipboardContent:
+        with self._lock:
+            if self._format == fmt:
+                return ClipboardContent(content=self._content, format=fmt, timestamp=time.time())
+        return ClipboardContent(content=None, format=ClipboardFormat.UNKNOWN, timestamp=time.time())
+
+    def get_clipboard(self) -> ClipboardContent:
+        return self._read(ClipboardFormat.TEXT)
+
+    def get_clipboard_image(self) -> ClipboardContent:
+        return self._read(ClipboardFormat.IMAGE)
+
+    def set_clipboard(self, content, content_type: str = "text") -> bool:
+        fmt = ClipboardFormat.IMAGE if content_type == "image" else ClipboardFormat.TEXT
+        self.set_content(content, fmt)
+        return True
+
+class ClipProducer(threading.Thread):
+    def __init__(self, clipboard: SimulatedClipboard, run_id: str, rate: float,
+                 size_mix: List[Tuple[int, float]], image_ratio: float, seed: int):
+        """
+        Write uniquely marked clips to the simulated clipboard at a fixed rate.
+
+        Args:
+            clipboard: Clipboard to write to
+            run_id: 8 hex digits making markers unique across runs on one database
+            rate: Clips per second
+            size_mix: (size in bytes, weight) pairs to sample clip sizes from
+            image_ratio: Fraction of clips produced as base64 "images"
+            seed: Random seed for reproducible runs
+        """
+        super().__init__(name="soak-producer", daemon=True)
+        self.clipboard = clipboard
+        self.marker_prefix = f"{MARKER_PREFIX}{run_id}-"
+        self.interval = 1.0 / rate
+        self.sizes = [size for size, _ in size_mix]
+        self.weights = [weight for _, weight in size_mix]
+        self.image_ratio = image_ratio
+        self.random = random.Random(seed)
+        self.produced: Dict[str, float] = {}
+        self._stop_flag = threading.Event()
+
+    def _make_clip(self, seq: int) -> Tuple[str, str, ClipboardFormat]:
+        marker = f"{self.marker_prefix}{seq:08d}"
+        size = self.random.choices(self.sizes, self.weights)[0]
+        if self.random.random() < self.image_ratio:
+            body = base64.b64encode(os.urandom(max(1, size * 3 // 4))).decode()
+            return marker, f"{marker} {body}", ClipboardFormat.IMAGE
+        return marker, f"{marker} " + "x" * max(0, size - MARKER_LENGTH - 1), ClipboardFormat.TEXT
+
+    def run(self):
+        seq = 0
+        next_at = time.monotonic()
+        while not self._stop_flag.is_set():
+            marker, content, fmt = self._make_clip(seq)
+            self.produced[marker] = time.monotonic()
+            self.clipboard.set_content(content, fmt)
+            seq += 1
+            next_at += self.interval
+            self._stop_flag.wait(max(0.0, next_at - time.monotonic()))
+
+    def stop(self):
+        self._stop_flag.set()
+        self.join()
+
+class SoakClient:
+    def __init__(self, url: str, produced: Dict[str, float]):
+        """
+        Socket.IO client recording when each marked clip first arrives.
+
+        Clips not produced by this run, such as rows left in a reused
+        database, are ignored.
+        """
+        import socketio
+        self.url = url
+        self.produced = produced
+        self.latencies: List[float] = []
+        self.seen: Dict[str, set] = {}
+        self.updates = 0
+        self.sio = socketio.Client()
+        self.sio.on('history_update', self._on_history_update)
+
+    def _on_history_update(self, items):
+        now = time.monotonic()
+        self.updates += 1
+        for item in items:
+            marker = extract_marker(item.get('content'))
+            sent = self.produced.get(marker)
+            if sent is None:
+                continue
+            version = (item['id'], item['timestamp'])
+            versions = self.seen.get(marker)
+            if versions is None:
+                self.seen[marker] = {version}
+                self.latencies.append(now - sent)
+            else:
+                versions.add(version)
+
+    @property
+    def duplicates(self) -> int:
+        """
+        Clips that arrived as a new history entry more than once.
+
+        Each clip is copied once, so a second row id or a bumped timestamp
+        for the same marker means it was captured and broadcast again.
+        """
+        return sum(len(versions) - 1 for versions in list(self.seen.values()))
+
+    def connect(self):
+        self.sio.connect(self.url, wait_timeout=10)
+
+    def disconnect(self):
+        self.sio.disconnect()
+
+class SoakHarness:
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.db_path = args.db or str(Path(os.getcwd()) / f"soak-{int(time.time())}.db")
+        self.clipboard = SimulatedClipboard()
+        self.manager = ClipboardManager(
+            db_path=self.db_path,
+            check_interval=args.check_interval,
+            clipboard=self.clipboard
+        )
+        self.web = WebInterface(self.manager, host=args.host, port=args.port)
+        self.run_id = os.urandom(4).hex()
+        self.producer = ClipProducer(
+            self.clipboard,
+            run_id=self.run_id,
+            rate=args.rate,
+            size_mix=parse_size_mix(args.sizes),
+            image_ratio=args.image_ratio,
+            seed=args.seed
+        )
+        self.clients: List[SoakClient] = []
+        self.samples: List[Dict] = []
+
+    def _start_server(self):
+        thread = threading.Thread(
+            target=self.web.socketio.run,
+            args=(self.web.app,),
+            kwargs={
+                'host': self.args.host,
+                'port': self.args.port,
+                'allow_unsafe_werkzeug': True,
+                'log_output': False,
+            },
+            name="soak-server",
+            daemon=True
+        )
+        thread.start()
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            try:
+                socket.create_connection((self.args.host, self.args.port), timeout=0.5).close()
+                return
+            except OSError:
+                time.sleep(0.1)
+        raise RuntimeError(f"Server did not start on {self.args.host}:{self.args.port}")
+
+    def _db_size(self) -> int:
+        return sum(
+            os.path.getsize(path)
+            for path in (self.db_path, self.db_path + '-wal')
+            if os.path.exists(path)
+        )
+
+    def _captured_markers(self) -> set:
+        with self.manager._get_db_connection() as conn:
+            cursor = conn.execute(
+                "SELECT substr(content, 1, ?) FROM clipboard_history WHERE content LIKE ?",
+                (MARKER_LENGTH, f"{self.producer.marker_prefix}%")
+            )
+            return {row[0] for row in cursor.fetchall()}
+
+    def _sample(self, started: float):
+        latencies = [lat for client in self.clients for lat in client.latencies]
+        sample = {
+            'elapsed': round(time.monotonic() - started, 1),
+            'produced': len(self.producer.produced),
+            'db_bytes': self._db_size(),
+            'rss_bytes': current_rss(),
+            'p50_ms': _ms(percentile(latencies, 50)),
+            'p99_ms': _ms(percentile(latencies, 99)),
+        }
+        self.samples.append(sample)
+        logging.info(
+            f"[{sample['elapsed']:>8}s] produced={sample['produced']} "
+            f"db={sample['db_bytes'] / 1e6:.1f}MB rss={sample['rss_bytes'] / 1e6:.1f}MB "
+            f"p50={sample['p50_ms']}ms p99={sample['p99_ms']}ms"
+        )
+
+    def run(self) -> Dict:
+        self._start_server()
+        url = f"http://{self.args.host}:{self.args.port}"
+        for _ in range(self.args.clients):
+            client = SoakClient(url, self.producer.produced)
+            client.connect()
+            self.clients.append(client)
+        logging.info(f"Connected {len(self.clients)} client(s) to {url}")
+
+        db_start = self._db_size()
+        started = time.monotonic()
+        self.manager.start_monitoring()
+        self.producer.start()
+        try:
+            end = started + self.args.duration
+            while time.monotonic() < end:
+                time.sleep(min(self.args.sample_interval, max(0.0, end - time.monotonic())))
+                self._sample(started)
+        except KeyboardInterrupt:
+            logging.info("Interrupted, writing report...")
+        finally:
+            self.producer.stop()
+            time.sleep(self.args.drain)
+            self.manager.stop_monitoring()
+            for client in self.clients:
+                client.disconnect()
+
+        return self._report(db_start)
+
+    def _report(self, db_start: int) -> Dict:
+        produced = set(self.producer.produced)
+        captured = self._captured_markers()
+        latencies = [lat for client in self.clients for lat in client.latencies]
+        dropped = [len(captured - set(client.seen)) for client in self.clients]
+        return {
+            'run_id': self.run_id,
+            'clips_produced': len(produced),
+            'clips_captured': len(captured & produced),
+            'missed_captures': len(produced - captured),
+            'clients': len(self.clients),
+            'events_received': len(latencies),
+            'events_dropped': sum(dropped),
+            'events_dropped_max_per_client': max(dropped, default=0),
+            'events_duplicated': sum(client.duplicates for client in self.clients),
+            'latency_p50_ms': _ms(percentile(latencies, 50)),
+            'latency_p99_ms': _ms(percentile(latencies, 99)),
+            'latency_max_ms': _ms(max(latencies, default=None)),
+            'db_bytes_start': db_start,
+            'db_bytes_end': self._db_size(),
+            'rss_bytes_peak': max((s['rss_bytes'] for s in self.samples), default=current_rss()),
+            'rss_bytes_end': current_rss(),
+            'handler_stats': self.manager.get_handler_stats(),
+            'samples': self.samples,
+        }
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return round(seconds * 1000, 2) if seconds is not None else None
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Clipkeeper load and soak test harness")
+    parser.add_argument('--rate', type=float, default=2.0, help='Clips produced per second')
+    parser.add_argument(
+        '--sizes',
+        default='64:0.7,4096:0.25,262144:0.05',
+        help='Clip size mix as size_bytes:weight pairs'
+    )
+    parser.add_argument('--image-ratio', type=float, default=0.1, help='Fraction of image clips')
+    parser.add_argument('--clients', type=int, default=5, help='Number of Socket.IO clients')
+    parser.add_argument('--duration', type=float, default=60.0, help='Run time in seconds')
+    parser.add_argument('--sample-interval', type=float, default=10.0, help='Seconds between samples')
+    parser.add_argument('--drain', type=float, default=2.0, help='Seconds to wait for late events')
+    parser.add_argument('--check-interval', type=float, default=0.3, help='Clipboard poll interval')
+    parser.add_argument('--host', default='127.0.0.1', help='Host to bind to')
+    parser.add_argument('--port', type=int, default=5055, help='Port to listen on')
+    parser.add_argument('--db', help='Database path (default: new file in cwd)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    parser.add_argument('--json', type=Path, help='Write the report to this JSON file')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    setup_logging()
+    report = SoakHarness(args).run()
+
+    summary = {k: v for k, v in report.items() if k != 'samples'}
+    print(json.dumps(summary, indent=2))
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+        logging.info(f"Report written to {args.json}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -6,7 +6,7 @@ import webbrowser
 import logging
 from ..core import ClipboardManager
 from ..web import WebInterface
-from ..utils import logger, setup_logger
+from ..utils import logger, setup_logger, profiler
 
 if sys.platform != "win32":
     raise EnvironmentError(
@@ -28,9 +28,17 @@ def cli(debug, log_file):
 @click.option('--host', default='127.0.0.1', help='Host to bind to')
 @click.option('--port', default=5000, help='Port to listen on')
 @click.option('--browser/--no-browser', default=True, help='Open web browser automatically')
-def start(host, port, browser):
+@click.option('--profile', is_flag=True, help='Profile the running daemon')
+@click.option('--profile-duration', default=60.0,
+              type=click.FloatRange(min=0, min_open=True),
+              help='Seconds to profile for')
+def start(host, port, browser, profile, profile_duration):
     """Start the clipboard manager and web interface"""
     try:
+        if profile:
+            profiler.start(profile_duration)
+            logger.info(f"Profiles will be written to {profiler.output_dir}")
+
         manager = ClipboardManager()
         manager.start_monitoring()
         logger.info("Clipboard monitoring started")
@@ -51,14 +59,32 @@ def start(host, port, browser):
     except Exception as e:
         logger.error(f"Error: {e}")
         sys.exit(1)
+    finally:
+        # The server swallows Ctrl+C and returns, so write profiles on any exit
+        profiler.stop()
+
+def filter_options(func):
+    """Add content type, time range and size filter options to a command."""
+    options = [
+        click.option('--type', 'content_type', type=click.Choice(['text', 'image']),
+                     help='Only show items of this type'),
+        click.option('--since', help='Only show items saved at or after this time'),
+        click.option('--until', help='Only show items saved before this time'),
+        click.option('--min-size', type=int, help='Minimum content size in bytes'),
+        click.option('--max-size', type=int, help='Maximum content size in bytes'),
+    ]
+    for option in reversed(options):
+        func = option(func)
+    return func
 
 @cli.command()
 @click.option('--limit', default=10, help='Number of items to show')
-def history(limit):
+@filter_options
+def history(limit, **filters):
     """Show clipboard history in the terminal"""
     try:
         manager = ClipboardManager()
-        items = manager.get_history(limit=limit)
+        items = manager.get_history(limit=limit, **filters)
         
         if not items:
             click.echo("No clipboard history found.")
@@ -87,11 +113,12 @@ def clear():
 
 @cli.command()
 @click.argument('pattern')
-def search(pattern):
+@filter_options
+def search(pattern, **filters):
     """Search clipboard history"""
     try:
         manager = ClipboardManager()
-        items = manager.search_history(pattern)
+        items = manager.search_history(pattern, **filters)
         
         if not items:
             click.echo("No matching items found.")
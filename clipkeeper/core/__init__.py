@@ -4,9 +4,12 @@ Core functionality for clipboard management.
 """
 from .manager import ClipboardManager
 from .clipboard import WindowsClipboard, get_clipboard_handler
+from .dispatch import ContentDispatcher, HandlerStats
 
 __all__ = [
     "ClipboardManager",
     "WindowsClipboard",
-    "get_clipboard_handler"
+    "get_clipboard_handler",
+    "ContentDispatcher",
+    "HandlerStats"
 ]
\ No newline at end of file
@@ -0,0 +1,247 @@
+import itertools
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Optional, List, Dict, Callable
+from .clipboard import ClipboardContent
+from ..utils.profiler import profiler
+
+ContentHandler = Callable[[ClipboardContent], None]
+
+# Minimum seconds between "queue full" warnings for a single handler
+DROP_WARNING_INTERVAL = 10.0
+
+@dataclass
+class HandlerStats:
+    delivered: int = 0
+    errors: int = 0
+    dropped: int = 0
+    timeouts: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+    queued: int = 0
+
+    @property
+    def avg_latency(self) -> float:
+        return self.total_latency / self.delivered if self.delivered else 0.0
+
+    def to_dict(self) -> Dict:
+        stats = asdict(self)
+        stats['avg_latency'] = self.avg_latency
+        return stats
+
+def _content_size(content: ClipboardContent, piece_length: int = 64 * 1024) -> int:
+    """UTF-8 size of the content in bytes, without encoding it in one piece."""
+    value = content.content
+    if value is None:
+        return 0
+    if isinstance(value, bytes) or value.isascii():
+        return len(value)
+    return sum(
+        len(value[start:start + piece_length].encode('utf-8', 'surrogatepass'))
+        for start in range(0, len(value), piece_length)
+    )
+
+class _HandlerWorker:
+    _ids = itertools.count(1)
+
+    def __init__(self, handler: ContentHandler, asynchronous: bool,
+                 queue_size: int, timeout: Optional[float], max_queue_bytes: int):
+        """
+        Delivery state for a single registered handler.
+
+        Args:
+            handler: Callback receiving new clipboard content
+            asynchronous: Run the handler on its own worker thread
+            queue_size: Maximum pending items before the oldest is dropped
+            timeout: Seconds a single call may take before it is counted as timed out
+            max_queue_bytes: Maximum total UTF-8 size of pending content before
+                the oldest item is dropped; the newest item is always kept
+        """
+        self.handler = handler
+        self.asynchronous = asynchronous
+        self.timeout = timeout
+        self.stats = HandlerStats()
+        self.key = f"{self.name}#{next(self._ids)}"
+        self._queue = queue.Queue(maxsize=max(1, queue_size))
+        self._max_queue_bytes = max_queue_bytes
+        self._queued_bytes = 0
+        self._submit_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stop_flag = threading.Event()
+        self._thread = None
+        self._last_drop_warning = 0.0
+        self._drops_since_warning = 0
+
+    @property
+    def name(self) -> str:
+        return getattr(self.handler, '__qualname__', repr(self.handler))
+
+    def submit(self, content: ClipboardContent):
+        """Deliver content inline or enqueue it for the worker thread."""
+        if not self.asynchronous:
+            self._invoke(content)
+            return
+
+        self._ensure_started()
+        size = _content_size(content)
+        with self._submit_lock:
+            # Keep the newest clipboard state; discard the oldest pending items
+            while self._queue.full() or (
+                self._queued_bytes + size > self._max_queue_bytes and not self._queue.empty()
+            ):
+                try:
+                    _, dropped_size = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                self._release(dropped_size)
+                self._queue.task_done()
+                self._record_drop()
+            with self._stats_lock:
+                self._queued_bytes += size
+            self._queue.put_nowait((content, size))
+
+    def _release(self, size: int):
+        with self._stats_lock:
+            self._queued_bytes -= size
+
+    def _record_drop(self):
+        now = time.monotonic()
+        with self._stats_lock:
+            self.stats.dropped += 1
+            self._drops_since_warning += 1
+            if now - self._last_drop_warning < DROP_WARNING_INTERVAL:
+                return
+            count, self._drops_since_warning = self._drops_since_warning, 0
+            self._last_drop_warning = now
+        logging.warning(f"Handler {self.name} queue full, dropped {count} oldest item(s)")
+
+    def _ensure_started(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop_flag.clear()
+            self._thread = threading.Thread(
+                target=self._run,
+                name=f"clipkeeper-handler-{self.name}"
+            )
+            self._thread.daemon = True
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop_flag.is_set():
+            try:
+                content, size = self._queue.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            self._release(size)
+            try:
+                with profiler.section('handler'):
+                    self._invoke(content)
+            except Exception as e:
+                logging.error(f"Error delivering to handler {self.name}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _invoke(self, content: ClipboardContent):
+        start = time.perf_counter()
+        failed = False
+        try:
+            self.handler(content)
+        except Exception as e:
+            failed = True
+            logging.error(f"Error in content handler {self.name}: {e}")
+        latency = time.perf_counter() - start
+
+        with self._stats_lock:
+            self.stats.delivered += 1
+            self.stats.total_latency += latency
+            self.stats.max_latency = max(self.stats.max_latency, latency)
+            if failed:
+                self.stats.errors += 1
+            if self.timeout is not None and latency > self.timeout:
+                self.stats.timeouts += 1
+                logging.warning(
+                    f"Content handler {self.name} took {latency:.3f}s "
+                    f"(timeout {self.timeout:.3f}s)"
+                )
+
+    def snapshot(self) -> Dict:
+        with self._stats_lock:
+            self.stats.queued = self._queue.qsize()
+            stats = self.stats.to_dict()
+        stats['asynchronous'] = self.asynchronous
+        return stats
+
+    def stop(self, timeout: float = 5.0):
+        """Drain pending items for up to `timeout` seconds, then stop the worker."""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self._stop_flag.set()
+        self._thread.join(timeout=max(0.0, deadline - time.monotonic()))
+        if self._thread.is_alive():
+            logging.warning(f"Handler worker {self.name} did not stop cleanly")
+
+class ContentDispatcher:
+    """
+    Fan out new clipboard content to registered handlers.
+
+    Asynchronous handlers each get a dedicated worker thread fed by a bounded
+    queue, so items reach a handler in capture order while a slow handler
+    never delays the monitor thread or other handlers.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._workers: List[_HandlerWorker] = []
+
+    def add(self, handler: ContentHandler, asynchronous: bool = False,
+            queue_size: int = 100, timeout: Optional[float] = 5.0,
+            max_queue_bytes: int = 16 * 1024 * 1024):
+        """Register a handler; registering the same handler twice is a no-op."""
+        with self._lock:
+            if any(w.handler == handler for w in self._workers):
+                return
+            self._workers.append(
+                _HandlerWorker(handler, asynchronous, queue_size, timeout, max_queue_bytes)
+            )
+
+    def remove(self, handler: ContentHandler):
+        """Unregister a handler, letting its worker finish pending items."""
+        with self._lock:
+            removed = [w for w in self._workers if w.handler == handler]
+            self._workers = [w for w in self._workers if w.handler != handler]
+        for worker in removed:
+            worker.stop()
+
+    def __contains__(self, handler: ContentHandler) -> bool:
+        with self._lock:
+            return any(w.handler == handler for w in self._workers)
+
+    def dispatch(self, content: ClipboardContent):
+        """Deliver content to every registered handler."""
+        with self._lock:
+            workers = list(self._workers)
+        for worker in workers:
+            worker.submit(content)
+
+    def stats(self) -> Dict[str, Dict]:
+        """
+        Return per-handler delivery counters.
+
+        Keys combine the handler name with a registration number, so bound
+        methods of different instances are reported separately.
+        """
+        with self._lock:
+            workers = list(self._workers)
+        return {w.key: w.snapshot() for w in workers}
+
+    def stop(self, timeout: float = 5.0):
+        """Stop all asynchronous workers; they restart on the next dispatch."""
+        with self._lock:
+            workers = list(self._workers)
+        for worker in workers:
+            worker.stop(timeout)
\ No newline at end of file
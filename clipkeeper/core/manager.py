@@ -2,31 +2,43 @@
 import sqlite3
 import threading
 import hashlib
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional, List, Dict, Union, Callable
+from typing import Optional, List, Dict, Tuple, Union, Callable, Iterable, Iterator
 import logging
+from dateutil import parser as date_parser
 from .clipboard import get_clipboard_handler, ClipboardContent, ClipboardFormat
+from .dispatch import ContentDispatcher
+from ..utils.profiler import profiler
 from contextlib import contextmanager
 import time
 
+# Text clips longer than this many characters are stored in chunks
+CHUNK_THRESHOLD = 1024 * 1024
+# Size in bytes of each stored chunk
+CHUNK_SIZE = 256 * 1024
+# Characters of a chunked clip kept inline for listings and search
+PREVIEW_LENGTH = 4096
+
 class ClipboardManager:
-    def __init__(self, db_path: Optional[str] = None, check_interval: float = 0.3):
+    def __init__(self, db_path: Optional[str] = None, check_interval: float = 0.3,
+                 clipboard=None):
         """
         Initialize clipboard manager.
         
         Args:
             db_path: Optional custom database path
             check_interval: Clipboard check interval in seconds (default: 0.3)
+            clipboard: Optional clipboard handler (default: platform handler)
         """
         self._stop_flag = threading.Event()
         self._lock = threading.Lock()
         self._monitor_thread = None
         self._check_interval = check_interval
         self._setup_database(db_path)
-        self.clipboard = get_clipboard_handler()
-        self._content_handlers = []
-        self._last_content = None
+        self.clipboard = clipboard if clipboard is not None else get_clipboard_handler()
+        self._dispatcher = ContentDispatcher()
+        self._last_hash = None
     
     def _setup_database(self, db_path: Optional[str] = None):
         """Set up the database file and connection."""
@@ -45,8 +57,48 @@ class ClipboardManager:
                     content TEXT NOT NULL,
                     content_type TEXT NOT NULL,
                     timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    hash TEXT UNIQUE NOT NULL
+                    hash TEXT UNIQUE NOT NULL,
+                    size INTEGER,
+                    chunked INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(clipboard_history)")}
+            if 'size' not in columns:
+                conn.execute("ALTER TABLE clipboard_history ADD COLUMN size INTEGER")
+            if 'chunked' not in columns:
+                conn.execute(
+                    "ALTER TABLE clipboard_history ADD COLUMN chunked INTEGER NOT NULL DEFAULT 0"
                 )
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS clipboard_chunks (
+                    item_id INTEGER NOT NULL,
+                    seq INTEGER NOT NULL,
+                    data BLOB NOT NULL,
+                    PRIMARY KEY (item_id, seq)
+                ) WITHOUT ROWID
+            """)
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS delete_clipboard_chunks
+                AFTER DELETE ON clipboard_history
+                WHEN OLD.chunked
+                BEGIN
+                    DELETE FROM clipboard_chunks WHERE item_id = OLD.id;
+                END
+            """)
+            conn.execute("""
+                UPDATE clipboard_history
+                SET size = length(CAST(content AS BLOB))
+                WHERE size IS NULL
+            """)
+            # Size is part of both indexes so size filters are evaluated
+            # without visiting table rows
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_history_type_time
+                ON clipboard_history (content_type, timestamp, id, size)
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_history_time
+                ON clipboard_history (timestamp, id, size)
             """)
     
     @contextmanager
@@ -68,59 +120,230 @@ class ClipboardManager:
     
     def _calculate_hash(self, content: str) -> str:
         """Calculate stable hash for content."""
-        return hashlib.sha256(str(content).encode('utf-8')).hexdigest()
+        if not isinstance(content, str):
+            return hashlib.sha256(str(content).encode('utf-8')).hexdigest()
+        digest = hashlib.sha256()
+        for piece in self._iter_encoded(content):
+            digest.update(piece)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _iter_encoded(content: str, piece_length: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """Encode text to UTF-8 piece by piece without copying it whole."""
+        for start in range(0, len(content), piece_length):
+            yield content[start:start + piece_length].encode('utf-8')
+
+    @staticmethod
+    def _iter_chunks(pieces: Iterable[bytes], chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """Regroup a stream of byte pieces into fixed-size chunks."""
+        buffer = bytearray()
+        for piece in pieces:
+            buffer += piece
+            while len(buffer) >= chunk_size:
+                yield bytes(buffer[:chunk_size])
+                del buffer[:chunk_size]
+        if buffer:
+            yield bytes(buffer)
+
+    @staticmethod
+    def _normalize_timestamp(value: Union[str, datetime]) -> str:
+        """
+        Convert a datetime or date string to the database's UTC timestamp format.
+        
+        Naive values are interpreted as local time.
+        """
+        if isinstance(value, str):
+            value = date_parser.parse(value)
+        return value.astimezone(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+    def _build_filters(
+        self,
+        content_type: Optional[str] = None,
+        since: Optional[Union[str, datetime]] = None,
+        until: Optional[Union[str, datetime]] = None,
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None
+    ) -> Tuple[List[str], List]:
+        """Build WHERE conditions and parameters for history queries."""
+        conditions, params = [], []
+        if content_type:
+            conditions.append("content_type = ?")
+            params.append(content_type)
+        if since is not None:
+            conditions.append("timestamp >= ?")
+            params.append(self._normalize_timestamp(since))
+        if until is not None:
+            conditions.append("timestamp < ?")
+            params.append(self._normalize_timestamp(until))
+        if min_size is not None:
+            conditions.append("size >= ?")
+            params.append(int(min_size))
+        if max_size is not None:
+            conditions.append("size <= ?")
+            params.append(int(max_size))
+        return conditions, params
+
+    def _history_query(
+        self,
+        limit: int,
+        offset: int = 0,
+        pattern: Optional[str] = None,
+        **filters
+    ) -> Tuple[str, List]:
+        """Build the SQL and parameters for a filtered history query."""
+        conditions, params = self._build_filters(**filters)
+        if pattern is not None:
+            like = f"%{pattern}%"
+            # Chunked rows only keep a preview inline, so also match each chunk
+            # joined with the head of the next one to catch matches that
+            # cross a chunk boundary
+            conditions.append("""
+                (content LIKE ? OR (chunked AND EXISTS (
+                    SELECT 1 FROM clipboard_chunks c
+                    LEFT JOIN clipboard_chunks n
+                        ON n.item_id = c.item_id AND n.seq = c.seq + 1
+                    WHERE c.item_id = clipboard_history.id
+                    AND CAST(c.data || coalesce(substr(n.data, 1, ?), x'') AS TEXT) LIKE ?
+                )))
+            """)
+            params.extend([like, max(0, len(pattern.encode('utf-8')) - 1), like])
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        sql = f"""
+            SELECT id, content, content_type, timestamp, size, chunked 
+            FROM clipboard_history 
+            {where}
+            ORDER BY timestamp DESC, id DESC
+            LIMIT ? OFFSET ?
+        """
+        return sql, [*params, limit, offset]
     
-    def _save_clipboard(self, content: Union[str, bytes], content_type: str = "text"):
+    def _save_clipboard(self, content: Union[str, bytes], content_type: str = "text",
+                        content_hash: Optional[str] = None):
         """
         Save clipboard content with deduplication.
         
         Args:
             content: The content to save (text or base64 encoded image)
             content_type: Type of content ("text" or "image")
+            content_hash: Precomputed hash of content, if available
         """
         if not content:
             return
             
-        content_hash = self._calculate_hash(content)
+        with profiler.section('writer'):
+            content_hash = content_hash or self._calculate_hash(content)
+            if content_type == "text" and isinstance(content, str) and len(content) > CHUNK_THRESHOLD:
+                self._save_chunked(self._iter_encoded(content), content[:PREVIEW_LENGTH],
+                                   content_type, content_hash)
+                return
+            try:
+                with self._get_db_connection() as conn:
+                    conn.execute(
+                        """
+                        INSERT INTO clipboard_history (content, content_type, hash, size)
+                        VALUES (?, ?, ?, length(CAST(? AS BLOB)))
+                        ON CONFLICT(hash) DO UPDATE SET timestamp=CURRENT_TIMESTAMP
+                        """,
+                        (content, content_type, content_hash, content)
+                    )
+            except Exception as e:
+                logging.error(f"Error saving to database: {e}")
+
+    def _save_chunked(self, pieces: Iterable[bytes], preview: str,
+                      content_type: str, content_hash: str):
+        """
+        Stream oversized content into fixed-size chunks.
+        
+        Args:
+            pieces: UTF-8 encoded content, in any piece sizes
+            preview: Leading text stored inline for listings and search
+            content_type: Type of content
+            content_hash: Hash of the full content, used for deduplication
+        """
         try:
             with self._get_db_connection() as conn:
-                conn.execute(
+                existing = conn.execute(
+                    "SELECT id FROM clipboard_history WHERE hash = ?",
+                    (content_hash,)
+                ).fetchone()
+                if existing:
+                    conn.execute(
+                        "UPDATE clipboard_history SET timestamp = CURRENT_TIMESTAMP WHERE id = ?",
+                        (existing[0],)
+                    )
+                    return
+
+                cursor = conn.execute(
                     """
-                    INSERT INTO clipboard_history (content, content_type, hash)
-                    VALUES (?, ?, ?)
-                    ON CONFLICT(hash) DO UPDATE SET timestamp=CURRENT_TIMESTAMP
+                    INSERT INTO clipboard_history (content, content_type, hash, size, chunked)
+                    VALUES (?, ?, ?, 0, 1)
                     """,
-                    (content, content_type, content_hash)
+                    (preview, content_type, content_hash)
+                )
+                item_id = cursor.lastrowid
+                size = 0
+                for seq, chunk in enumerate(self._iter_chunks(pieces)):
+                    conn.execute(
+                        "INSERT INTO clipboard_chunks (item_id, seq, data) VALUES (?, ?, ?)",
+                        (item_id, seq, chunk)
+                    )
+                    size += len(chunk)
+                conn.execute(
+                    "UPDATE clipboard_history SET size = ? WHERE id = ?",
+                    (size, item_id)
                 )
         except Exception as e:
-            logging.error(f"Error saving to database: {e}")
+            logging.error(f"Error saving chunked content to database: {e}")
 
-    def add_content_handler(self, handler: Callable[[ClipboardContent], None]):
-        """Add a callback function to handle new content"""
-        if handler not in self._content_handlers:
-            self._content_handlers.append(handler)
+    def add_content_handler(
+        self,
+        handler: Callable[[ClipboardContent], None],
+        asynchronous: bool = False,
+        queue_size: int = 100,
+        timeout: Optional[float] = 5.0,
+        max_queue_bytes: int = 16 * 1024 * 1024
+    ):
+        """
+        Add a callback function to handle new content.
+        
+        Args:
+            handler: Callback receiving each new ClipboardContent
+            asynchronous: Deliver on a dedicated worker thread instead of the
+                monitor thread, preserving capture order
+            queue_size: Pending items kept for an asynchronous handler before
+                the oldest is dropped
+            timeout: Seconds a call may take before it is logged and counted
+                as a timeout (None disables the check)
+            max_queue_bytes: Total content size kept pending for an
+                asynchronous handler before the oldest items are dropped
+        """
+        self._dispatcher.add(handler, asynchronous, queue_size, timeout, max_queue_bytes)
 
     def remove_content_handler(self, handler: Callable[[ClipboardContent], None]):
         """Remove a content handler callback"""
-        if handler in self._content_handlers:
-            self._content_handlers.remove(handler)
+        self._dispatcher.remove(handler)
+
+    def get_handler_stats(self) -> Dict[str, Dict]:
+        """Return per-handler latency, error, timeout and drop counters."""
+        return self._dispatcher.stats()
 
     def _handle_new_content(self, content: ClipboardContent):
         """Handle new clipboard content"""
         try:
-            if content.content is not None and content.content != self._last_content:
-                self._last_content = content.content
+            if content.content is None:
+                return
+            # Compare by hash so large clips are not kept in memory between polls
+            content_hash = self._calculate_hash(content.content)
+            if content_hash != self._last_hash:
+                self._last_hash = content_hash
                 
                 self._save_clipboard(
                     content.content,
-                    "text" if content.format == ClipboardFormat.TEXT else "image"
+                    "text" if content.format == ClipboardFormat.TEXT else "image",
+                    content_hash
                 )
                 
-                for handler in self._content_handlers:
-                    try:
-                        handler(content)
-                    except Exception as e:
-                        logging.error(f"Error in content handler: {e}")
+                self._dispatcher.dispatch(content)
                         
         except Exception as e:
             logging.error(f"Error handling new content: {e}")
@@ -129,15 +352,16 @@ class ClipboardManager:
         """Monitor clipboard with enhanced error handling"""
         while not self._stop_flag.is_set():
             try:
-                content_result = self.clipboard.get_clipboard()
-                if content_result and content_result.content is not None:
-                    self._handle_new_content(content_result)
-                
-                time.sleep(0.1)
-                
-                image_result = self.clipboard.get_clipboard_image()
-                if image_result and image_result.content is not None:
-                    self._handle_new_content(image_result)
+                with profiler.section('monitor'):
+                    content_result = self.clipboard.get_clipboard()
+                    if content_result and content_result.content is not None:
+                        self._handle_new_content(content_result)
+                    
+                    time.sleep(0.1)
+                    
+                    image_result = self.clipboard.get_clipboard_image()
+                    if image_result and image_result.content is not None:
+                        self._handle_new_content(image_result)
                     
             except Exception as e:
                 logging.error(f"Clipboard monitoring error: {e}")
@@ -145,52 +369,88 @@ class ClipboardManager:
             
             self._stop_flag.wait(self._check_interval)
     
-    def get_history(self, limit: int = 100, offset: int = 0) -> List[Dict]:
-        """Retrieve clipboard history with pagination."""
+    def get_history(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        content_type: Optional[str] = None,
+        since: Optional[Union[str, datetime]] = None,
+        until: Optional[Union[str, datetime]] = None,
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Retrieve clipboard history with pagination and optional filters.
+        
+        Args:
+            limit: Maximum number of items to return
+            offset: Number of items to skip
+            content_type: Only return items of this type ("text" or "image")
+            since: Only return items saved at or after this time
+            until: Only return items saved before this time
+            min_size: Minimum content size in bytes
+            max_size: Maximum content size in bytes
+        """
+        sql, params = self._history_query(
+            limit, offset,
+            content_type=content_type, since=since, until=until,
+            min_size=min_size, max_size=max_size
+        )
         with self._get_db_connection() as conn:
-            cursor = conn.execute(
-                """
-                SELECT id, content, content_type, timestamp 
-                FROM clipboard_history 
-                ORDER BY timestamp DESC, id DESC
-                LIMIT ? OFFSET ?
-                """,
-                (limit, offset)
-            )
+            cursor = conn.execute(sql, params)
             return [
                 {
                     'id': row[0],
                     'content': row[1],
                     'content_type': row[2],
-                    'timestamp': row[3]
+                    'timestamp': row[3],
+                    'size': row[4],
+                    'chunked': bool(row[5])
                 }
                 for row in cursor.fetchall()
             ]
         
     def clear_history(self):
         """Clear all clipboard history."""
-        with self._get_db_connection() as conn:
+        with profiler.section('writer'), self._get_db_connection() as conn:
             conn.execute("DELETE FROM clipboard_history")
     
-    def search_history(self, pattern: str, limit: int = 100) -> List[Dict]:
-        """Search clipboard history for pattern."""
+    def search_history(
+        self,
+        pattern: str,
+        limit: int = 100,
+        offset: int = 0,
+        content_type: Optional[str] = None,
+        since: Optional[Union[str, datetime]] = None,
+        until: Optional[Union[str, datetime]] = None,
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Search clipboard history for pattern.
+        
+        Accepts the same filters as get_history; they are applied through
+        the indexes before the pattern is matched. Chunked items are matched
+        against their full stored content, but, as in get_history, their
+        'content' is only a preview; use read_item for the rest. A pattern
+        containing LIKE wildcards can miss matches that span more than two
+        chunks.
+        """
+        sql, params = self._history_query(
+            limit, offset, pattern=pattern,
+            content_type=content_type, since=since, until=until,
+            min_size=min_size, max_size=max_size
+        )
         with self._get_db_connection() as conn:
-            cursor = conn.execute(
-                """
-                SELECT id, content, content_type, timestamp 
-                FROM clipboard_history 
-                WHERE content LIKE ? 
-                ORDER BY timestamp DESC 
-                LIMIT ?
-                """,
-                (f"%{pattern}%", limit)
-            )
+            cursor = conn.execute(sql, params)
             return [
                 {
                     'id': row[0],
                     'content': row[1],
                     'content_type': row[2],
-                    'timestamp': row[3]
+                    'timestamp': row[3],
+                    'size': row[4],
+                    'chunked': bool(row[5])
                 }
                 for row in cursor.fetchall()
             ]
@@ -198,7 +458,7 @@ class ClipboardManager:
     def delete_item(self, item_id: int) -> bool:
         """Delete a specific clipboard history item."""
         try:
-            with self._get_db_connection() as conn:
+            with profiler.section('writer'), self._get_db_connection() as conn:
                 conn.execute(
                     "DELETE FROM clipboard_history WHERE id = ?",
                     (item_id,)
@@ -208,11 +468,101 @@ class ClipboardManager:
             logging.error(f"Error deleting item: {e}")
             return False
 
+    def get_item(self, item_id: int) -> Optional[Dict]:
+        """Retrieve metadata for a clipboard history item, without its content."""
+        with self._get_db_connection() as conn:
+            row = conn.execute(
+                """
+                SELECT id, content_type, timestamp, size, chunked
+                FROM clipboard_history
+                WHERE id = ?
+                """,
+                (item_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            'id': row[0],
+            'content_type': row[1],
+            'timestamp': row[2],
+            'size': row[3],
+            'chunked': bool(row[4])
+        }
+
+    def read_item(self, item_id: int, offset: int = 0,
+                  length: Optional[int] = None) -> Optional[bytes]:
+        """
+        Read a byte range of an item's UTF-8 encoded content.
+        
+        Args:
+            item_id: ID of the history item
+            offset: Byte offset to start reading from
+            length: Number of bytes to read (default: to the end)
+            
+        Returns:
+            The requested bytes, or None if the item does not exist
+        """
+        if offset < 0 or (length is not None and length < 0):
+            raise ValueError("offset and length must be non-negative")
+        with self._get_db_connection() as conn:
+            row = conn.execute(
+                "SELECT size, chunked FROM clipboard_history WHERE id = ?",
+                (item_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            size, chunked = row
+            end = size if length is None else min(size, offset + length)
+            if offset >= end:
+                return b""
+
+            if not chunked:
+                result = conn.execute(
+                    "SELECT substr(CAST(content AS BLOB), ?, ?) FROM clipboard_history WHERE id = ?",
+                    (offset + 1, end - offset, item_id)
+                ).fetchone()
+                return bytes(result[0])
+
+            first, last = offset // CHUNK_SIZE, (end - 1) // CHUNK_SIZE
+            cursor = conn.execute(
+                """
+                SELECT data FROM clipboard_chunks
+                WHERE item_id = ? AND seq BETWEEN ? AND ?
+                ORDER BY seq
+                """,
+                (item_id, first, last)
+            )
+            data = b"".join(row[0] for row in cursor)
+            start = offset - first * CHUNK_SIZE
+            return data[start:start + end - offset]
+
+    def iter_item(self, item_id: int, offset: int = 0, length: Optional[int] = None,
+                  chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        Stream a byte range of an item's content in pieces of `chunk_size`.
+        
+        Each piece is read separately, so the database is not held for the
+        whole transfer.
+        """
+        item = self.get_item(item_id)
+        if item is None:
+            return
+        end = item['size'] if length is None else min(item['size'], offset + length)
+        while offset < end:
+            data = self.read_item(item_id, offset, min(chunk_size, end - offset))
+            if not data:
+                return
+            yield data
+            offset += len(data)
+
     def start_monitoring(self):
         """Start clipboard monitoring"""
         if self._monitor_thread is None or not self._monitor_thread.is_alive():
             self._stop_flag.clear()
-            self._monitor_thread = threading.Thread(target=self.monitor_clipboard)
+            self._monitor_thread = threading.Thread(
+                target=self.monitor_clipboard,
+                name="clipkeeper-monitor"
+            )
             self._monitor_thread.daemon = True
             self._monitor_thread.start()
             logging.info("Clipboard monitoring started")
@@ -226,6 +576,7 @@ class ClipboardManager:
                 logging.warning("Monitor thread did not stop cleanly")
             else:
                 logging.info("Clipboard monitoring stopped")
+        self._dispatcher.stop()
 
     def __enter__(self):
         """Context manager support"""
@@ -1,8 +1,10 @@
 # clipkeeper/run.py
+import argparse
 import logging
 import webbrowser
 import time
 from clipkeeper import ClipboardManager, WebInterface
+from clipkeeper.utils import profiler
 
 def setup_logging():
     """Configure basic logging."""
@@ -12,11 +14,35 @@ def setup_logging():
         datefmt='%Y-%m-%d %H:%M:%S'
     )
 
+def positive_float(value):
+    """Argparse type accepting only positive numbers."""
+    number = float(value)
+    if not number > 0:
+        raise argparse.ArgumentTypeError(f"must be positive: {value}")
+    return number
+
+def parse_args():
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Run Clipkeeper")
+    parser.add_argument('--profile', action='store_true', help='Profile the running daemon')
+    parser.add_argument(
+        '--profile-duration',
+        type=positive_float,
+        default=60.0,
+        help='Seconds to profile for'
+    )
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
     setup_logging()
     logging.info("Starting Clipkeeper...")
     
     try:
+        if args.profile:
+            profiler.start(args.profile_duration)
+            logging.info(f"✓ Profiles will be written to {profiler.output_dir}")
+        
         manager = ClipboardManager()
         manager.start_monitoring()
         logging.info("✓ Clipboard monitoring started")
@@ -40,6 +66,9 @@ def main():
     except Exception as e:
         logging.error(f"Error: {e}")
         raise
+    finally:
+        # The server swallows Ctrl+C and returns, so write profiles on any exit
+        profiler.stop()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
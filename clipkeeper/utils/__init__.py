@@ -3,5 +3,6 @@
 Utility functions and helpers for Clipkeeper.
 """
 from .logger import setup_logger, logger
+from .profiler import Profiler, profiler
 
-__all__ = ["setup_logger", "logger"]
\ No newline at end of file
+__all__ = ["setup_logger", "logger", "Profiler", "profiler"]
\ No newline at end of file
@@ -0,0 +1,231 @@
+"""
+On-demand profiling for Clipkeeper's long-running threads.
+"""
+import cProfile
+import logging
+import pstats
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, List, Dict, Tuple
+
+DEFAULT_PROFILE_DIR = Path.home() / '.clipkeeper' / 'profiles'
+
+# From Python 3.12 cProfile hooks sys.monitoring, which is process-wide: only
+# one profiler can be enabled at a time and it records every thread
+PER_THREAD_PROFILING = sys.version_info < (3, 12)
+
+class _NullSection:
+    """Shared no-op section returned while profiling is off."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+_NULL_SECTION = _NullSection()
+
+class _Section:
+    def __init__(self, profiler: "Profiler", label: str):
+        self._profiler = profiler
+        self._label = label
+
+    def __enter__(self):
+        self._profiler._enter(self._label)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._profiler._exit()
+        return False
+
+class Profiler:
+    def __init__(self, output_dir: Optional[Path] = None):
+        """
+        Collect cProfile data from instrumented code sections.
+
+        Before Python 3.12 each thread gets one cProfile.Profile per label.
+        A nested section pauses its enclosing section's profile until it
+        exits, so time is attributed to the innermost label. From 3.12 a
+        single process-wide profile is recorded under the label "process"
+        and sections are no-ops. When profiling is off, `section()` only
+        checks a flag and returns a shared no-op context manager.
+
+        Args:
+            output_dir: Directory for dumped profiles (default: ~/.clipkeeper/profiles)
+        """
+        self.output_dir = Path(output_dir) if output_dir else DEFAULT_PROFILE_DIR
+        self._active = False
+        self._lock = threading.Condition()
+        self._local = threading.local()
+        self._profiles: Dict[Tuple[str, int], cProfile.Profile] = {}
+        self._process_profile = None
+        self._in_flight = 0
+        self._started_at = None
+        self._deadline = None
+        self._timer = None
+
+    @property
+    def active(self) -> bool:
+        return self._active
+
+    def section(self, label: str):
+        """Return a context manager profiling the enclosed code under `label`."""
+        if not self._active or not PER_THREAD_PROFILING:
+            return _NULL_SECTION
+        return _Section(self, label)
+
+    def start(self, duration: Optional[float] = 60.0) -> bool:
+        """
+        Start profiling for `duration` seconds (None runs until stop()).
+
+        Returns:
+            False if profiling was already running or could not be enabled
+        """
+        if duration is not None and duration <= 0:
+            raise ValueError("Profiling duration must be positive")
+        with self._lock:
+            if self._active:
+                return False
+            self._profiles = {}
+            if not PER_THREAD_PROFILING:
+                profile = cProfile.Profile()
+                try:
+                    profile.enable()
+                except ValueError as e:
+                    logging.error(f"Could not start profiling: {e}")
+                    return False
+                self._process_profile = profile
+                self._profiles[('process', 0)] = profile
+            self._started_at = time.time()
+            self._deadline = self._started_at + duration if duration else None
+            self._active = True
+            if duration:
+                self._timer = threading.Timer(duration, self.stop)
+                self._timer.daemon = True
+                self._timer.start()
+        if duration:
+            logging.info(f"Profiling started for {duration:g}s")
+        else:
+            logging.info("Profiling started")
+        return True
+
+    def stop(self) -> List[Path]:
+        """Stop profiling and dump collected profiles, returning the written files."""
+        with self._lock:
+            if not self._active:
+                return []
+            self._active = False
+            if self._timer is not None and self._timer is not threading.current_thread():
+                self._timer.cancel()
+            self._timer = None
+            # Let in-flight sections on other threads finish so their
+            # profiles are complete
+            own = sum(1 for _, profile in getattr(self._local, 'stack', []) if profile is not None)
+            self._lock.wait_for(lambda: self._in_flight <= own, timeout=5.0)
+            if self._process_profile is not None:
+                self._process_profile.disable()
+                self._process_profile = None
+            profiles = self._profiles
+            self._profiles = {}
+            started_at = self._started_at
+        return self._dump(profiles, started_at)
+
+    def status(self) -> Dict:
+        """Return whether profiling is running and for how much longer."""
+        with self._lock:
+            remaining = None
+            if self._active and self._deadline is not None:
+                remaining = max(0.0, self._deadline - time.time())
+            return {
+                'active': self._active,
+                'remaining': remaining,
+                'threads': len(self._profiles),
+                'output_dir': str(self.output_dir),
+            }
+
+    def _enter(self, label: str):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        # A nested section with the same label keeps recording into the outer profile
+        if stack and stack[-1][0] == label:
+            stack.append([label, None])
+            return
+        with self._lock:
+            if not self._active:
+                stack.append([label, None])
+                return
+            key = (label, threading.get_ident())
+            profile = self._profiles.get(key)
+            if profile is None:
+                profile = self._profiles[key] = cProfile.Profile()
+            self._in_flight += 1
+        # Only one profile per thread can be enabled; pause the enclosing one
+        self._switch(stack, enable=False)
+        stack.append([label, profile])
+        self._switch(stack, enable=True)
+
+    def _exit(self):
+        _, profile = self._local.stack.pop()
+        if profile is None:
+            return
+        try:
+            profile.disable()
+        except Exception as e:
+            logging.debug(f"Could not disable profile: {e}")
+        self._release()
+        self._switch(self._local.stack, enable=True)
+
+    def _switch(self, stack: List[list], enable: bool):
+        """Enable or disable the innermost recording profile on this thread."""
+        for entry in reversed(stack):
+            if entry[1] is None:
+                continue
+            try:
+                if enable:
+                    entry[1].enable()
+                else:
+                    entry[1].disable()
+            except Exception as e:
+                # Never let profiling break the code being profiled
+                logging.debug(f"Could not switch {entry[0]} profile: {e}")
+                entry[1] = None
+                self._release()
+            return
+
+    def _release(self):
+        with self._lock:
+            self._in_flight -= 1
+            self._lock.notify_all()
+
+    def _dump(self, profiles: Dict[Tuple[str, int], cProfile.Profile],
+              started_at: float) -> List[Path]:
+        by_label: Dict[str, List[cProfile.Profile]] = {}
+        for (label, _), profile in profiles.items():
+            by_label.setdefault(label, []).append(profile)
+
+        written = []
+        if not by_label:
+            logging.info("Profiling stopped, no samples collected")
+            return written
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.fromtimestamp(started_at).strftime('%Y%m%d-%H%M%S')
+        for label, label_profiles in by_label.items():
+            try:
+                stats = pstats.Stats(label_profiles[0])
+                for profile in label_profiles[1:]:
+                    stats.add(profile)
+                path = self.output_dir / f"{stamp}-{label}.pstats"
+                stats.dump_stats(str(path))
+                written.append(path)
+            except Exception as e:
+                logging.error(f"Error writing {label} profile: {e}")
+
+        logging.info(f"Profiling stopped, wrote {len(written)} profile(s) to {self.output_dir}")
+        return written
+
+profiler = Profiler()
\ No newline at end of file
@@ -1,10 +1,22 @@
 # clipkeeper/web/server.py
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Response, render_template, jsonify, request, g, stream_with_context
 from flask_socketio import SocketIO
 import threading
 from datetime import datetime
 import logging
-import time
+from ..utils.profiler import profiler
+
+MAX_HISTORY_LIMIT = 500
+
+def _int_arg(name, default=None):
+    """Read an integer query parameter, raising ValueError if it is malformed."""
+    value = request.args.get(name, '')
+    if value == '':
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer")
 
 class WebInterface:
     def __init__(self, clipboard_manager, host='127.0.0.1', port=5000):
@@ -18,13 +30,16 @@ class WebInterface:
         self.register_routes()
         self.register_socket_events()
         
-        # Add handler for new clipboard content
-        self.clipboard_manager.add_content_handler(self._on_new_clipboard_content)
+        # Add handler for new clipboard content; broadcasting runs off the
+        # monitor thread so slow clients never delay clipboard polling
+        self.clipboard_manager.add_content_handler(
+            self._on_new_clipboard_content,
+            asynchronous=True
+        )
 
     def _on_new_clipboard_content(self, content):
         """Broadcast new clipboard content to all connected clients"""
         try:
-            time.sleep(0.1)
             items = self.clipboard_manager.get_history(limit=50)
             self.socketio.emit('history_update', items)
         except Exception as e:
@@ -33,13 +48,26 @@ class WebInterface:
     def register_socket_events(self):
         @self.socketio.on('connect')
         def handle_connect():
-            try:
-                items = self.clipboard_manager.get_history(limit=50)
-                self.socketio.emit('history_update', items)
-            except Exception as e:
-                logging.error(f"Error sending initial history: {e}")
+            with profiler.section('request'):
+                try:
+                    items = self.clipboard_manager.get_history(limit=50)
+                    self.socketio.emit('history_update', items)
+                except Exception as e:
+                    logging.error(f"Error sending initial history: {e}")
 
     def register_routes(self):
+        @self.app.before_request
+        def start_request_profile():
+            if profiler.active:
+                g.profile_section = profiler.section('request')
+                g.profile_section.__enter__()
+
+        @self.app.teardown_request
+        def stop_request_profile(exc):
+            section = g.pop('profile_section', None)
+            if section is not None:
+                section.__exit__(None, None, None)
+
         @self.app.route('/')
         def index():
             return render_template('index.html')
@@ -48,11 +76,25 @@ class WebInterface:
         def get_history():
             search_query = request.args.get('search', '')
             try:
+                filters = {
+                    'content_type': request.args.get('type') or None,
+                    'since': request.args.get('since') or None,
+                    'until': request.args.get('until') or None,
+                    'min_size': _int_arg('min_size'),
+                    'max_size': _int_arg('max_size'),
+                }
+                # SQLite treats a negative LIMIT as unlimited, so clamp both ends
+                limit = max(1, min(_int_arg('limit', 50), MAX_HISTORY_LIMIT))
+                offset = max(0, _int_arg('offset', 0))
                 if search_query:
-                    items = self.clipboard_manager.search_history(search_query, limit=50)
+                    items = self.clipboard_manager.search_history(
+                        search_query, limit=limit, offset=offset, **filters
+                    )
                 else:
-                    items = self.clipboard_manager.get_history(limit=50)
+                    items = self.clipboard_manager.get_history(limit=limit, offset=offset, **filters)
                 return jsonify(items)
+            except (ValueError, OverflowError) as e:
+                return jsonify({'error': f'Invalid filter: {e}'}), 400
             except Exception as e:
                 logging.error(f"Error retrieving history: {e}")
                 return jsonify({'error': 'Failed to retrieve history'}), 500
@@ -60,28 +102,47 @@ class WebInterface:
         @self.app.route('/api/copy/<int:item_id>', methods=['POST'])
         def copy_item(item_id):
             try:
-                with self.clipboard_manager._get_db_connection() as conn:
-                    cursor = conn.execute(
-                        """
-                        SELECT content, content_type 
-                        FROM clipboard_history 
-                        WHERE id = ?
-                        """,
-                        (item_id,)
-                    )
-                    result = cursor.fetchone()
-                    
-                    if result:
-                        content, content_type = result
-                        success = self.clipboard_manager.clipboard.set_clipboard(content, content_type)
-                        if success:
-                            return jsonify({'success': True})
-                        return jsonify({'error': 'Failed to set clipboard'}), 500
-                    return jsonify({'error': 'Item not found'}), 404
+                item = self.clipboard_manager.get_item(item_id)
+                if item:
+                    content = self.clipboard_manager.read_item(item_id).decode('utf-8')
+                    success = self.clipboard_manager.clipboard.set_clipboard(content, item['content_type'])
+                    if success:
+                        return jsonify({'success': True})
+                    return jsonify({'error': 'Failed to set clipboard'}), 500
+                return jsonify({'error': 'Item not found'}), 404
             except Exception as e:
                 logging.error(f"Error copying item: {e}")
                 return jsonify({'error': str(e)}), 500
 
+        @self.app.route('/api/item/<int:item_id>/content')
+        def download_item(item_id):
+            item = self.clipboard_manager.get_item(item_id)
+            if item is None:
+                return jsonify({'error': 'Item not found'}), 404
+
+            size = item['size']
+            start, stop, status = 0, size, 200
+            if request.range is not None:
+                byte_range = request.range.range_for_length(size)
+                if byte_range is None:
+                    return Response(status=416, headers={'Content-Range': f'bytes */{size}'})
+                start, stop = byte_range
+                status = 206
+
+            body = self.clipboard_manager.iter_item(item_id, start, stop - start)
+            response = Response(
+                stream_with_context(body),
+                status=status,
+                mimetype='text/plain; charset=utf-8'
+            )
+            response.headers['Accept-Ranges'] = 'bytes'
+            response.headers['Content-Length'] = str(stop - start)
+            if status == 206:
+                response.headers['Content-Range'] = f'bytes {start}-{stop - 1}/{size}'
+            if request.args.get('download'):
+                response.headers['Content-Disposition'] = f'attachment; filename="clip-{item_id}.txt"'
+            return response
+
         @self.app.route('/api/delete/<int:item_id>', methods=['DELETE'])
         def delete_item(item_id):
             try:
@@ -96,6 +157,28 @@ class WebInterface:
                 logging.error(f"Error deleting item: {e}")
                 return jsonify({'error': str(e)}), 500
 
+        @self.app.route('/api/profile', methods=['GET', 'POST'])
+        def toggle_profile():
+            if request.method == 'GET':
+                return jsonify(profiler.status())
+            data = request.get_json(silent=True) or {}
+            if not isinstance(data, dict):
+                return jsonify({'error': 'Request body must be a JSON object'}), 400
+            try:
+                if data.get('enabled', True):
+                    duration = float(data.get('duration', 60))
+                    if not (0 < duration < float('inf')):
+                        raise ValueError(duration)
+                    if profiler.active:
+                        return jsonify({'error': 'Profiling already running'}), 409
+                    if not profiler.start(duration):
+                        return jsonify({'error': 'Failed to start profiling'}), 500
+                    return jsonify(profiler.status())
+                written = profiler.stop()
+                return jsonify({'active': False, 'files': [str(p) for p in written]})
+            except (TypeError, ValueError):
+                return jsonify({'error': 'Invalid profiling duration'}), 400
+
         @self.app.errorhandler(Exception)
         def handle_error(e):
             logging.error(f"Unhandled error: {e}")
@@ -47,6 +47,14 @@ document.addEventListener('DOMContentLoaded', () => {
                 <div class="px-3 py-2 bg-gray-900/80 flex items-center justify-between text-[10px] text-gray-500 border-t border-gray-800/50">
                     <span class="select-none">${time}</span>
                     <div class="flex gap-2">
+                        ${item.chunked
+                            ? `<a href="/api/item/${item.id}/content?download=1" class="action-button hover:text-gray-300 transition-all p-1.5 hover:bg-gray-800/50 rounded-md" title="Download full clip">
+                                <svg class="w-3 h-3" fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                                    <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M4 16v1a3 3 0 003 3h10a3 3 0 003-3v-1m-4-4l-4 4m0 0l-4-4m4 4V4" />
+                                </svg>
+                               </a>`
+                            : ''
+                        }
                         <button onclick="copyItem(${item.id})" class="action-button hover:text-gray-300 transition-all p-1.5 hover:bg-gray-800/50 rounded-md" title="Copy">
                             <svg class="w-3 h-3" fill="none" stroke="currentColor" viewBox="0 0 24 24">
                                 <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M8 5H6a2 2 0 00-2 2v12a2 2 0 002 2h10a2 2 0 002-2v-2M8 5a2 2 0 002 2h2a2 2 0 002-2M8 5a2 2 0 012-2h2a2 2 0 012 2" />
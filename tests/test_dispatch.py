@@ -0,0 +1,177 @@
+import threading
+import time
+
+from clipkeeper.core.clipboard import ClipboardContent, ClipboardFormat
+from clipkeeper.core.dispatch import ContentDispatcher
+
+
+def make_content(text):
+    return ClipboardContent(content=text, format=ClipboardFormat.TEXT, timestamp=time.time())
+
+
+def test_sync_handler_runs_inline_and_counts_errors():
+    dispatcher = ContentDispatcher()
+    received = []
+
+    def failing(content):
+        raise ValueError("boom")
+
+    dispatcher.add(received.append)
+    dispatcher.add(failing)
+    dispatcher.dispatch(make_content("a"))
+
+    assert [c.content for c in received] == ["a"]
+    stats = list(dispatcher.stats().values())
+    assert stats[0]['delivered'] == 1 and stats[0]['errors'] == 0
+    assert stats[1]['delivered'] == 1 and stats[1]['errors'] == 1
+
+
+def test_async_handler_preserves_order():
+    dispatcher = ContentDispatcher()
+    received = []
+    dispatcher.add(lambda c: received.append(c.content), asynchronous=True)
+
+    for i in range(20):
+        dispatcher.dispatch(make_content(str(i)))
+    dispatcher.stop()
+
+    assert received == [str(i) for i in range(20)]
+
+
+def test_slow_async_handler_does_not_block_dispatch():
+    dispatcher = ContentDispatcher()
+    release = threading.Event()
+    dispatcher.add(lambda c: release.wait(5), asynchronous=True)
+
+    start = time.perf_counter()
+    for i in range(5):
+        dispatcher.dispatch(make_content(str(i)))
+    elapsed = time.perf_counter() - start
+
+    release.set()
+    dispatcher.stop()
+    assert elapsed < 0.5
+
+
+def test_full_queue_drops_oldest_items():
+    dispatcher = ContentDispatcher()
+    release = threading.Event()
+    started = threading.Event()
+    received = []
+
+    def handler(content):
+        started.set()
+        release.wait(5)
+        received.append(content.content)
+
+    dispatcher.add(handler, asynchronous=True, queue_size=3)
+    dispatcher.dispatch(make_content("first"))
+    assert started.wait(5)
+    for i in range(10):
+        dispatcher.dispatch(make_content(str(i)))
+    release.set()
+    dispatcher.stop()
+
+    assert received == ["first", "7", "8", "9"]
+    assert list(dispatcher.stats().values())[0]['dropped'] == 7
+
+
+def test_queue_is_bounded_by_bytes():
+    dispatcher = ContentDispatcher()
+    release = threading.Event()
+    started = threading.Event()
+    received = []
+
+    def handler(content):
+        started.set()
+        release.wait(5)
+        received.append(len(content.content))
+
+    dispatcher.add(handler, asynchronous=True, max_queue_bytes=250)
+    dispatcher.dispatch(make_content("x"))
+    assert started.wait(5)
+    for size in (100, 100, 100, 300):
+        dispatcher.dispatch(make_content("y" * size))
+    release.set()
+    dispatcher.stop()
+
+    # The oversized newest item is kept even though it exceeds the cap alone
+    assert received == [1, 300]
+
+
+def test_queue_byte_cap_counts_utf8_bytes():
+    dispatcher = ContentDispatcher()
+    release = threading.Event()
+    started = threading.Event()
+    received = []
+
+    def handler(content):
+        started.set()
+        release.wait(5)
+        received.append(content.content)
+
+    # Each item is 60 characters but 180 UTF-8 bytes, so only one fits
+    dispatcher.add(handler, asynchronous=True, max_queue_bytes=250)
+    dispatcher.dispatch(make_content("x"))
+    assert started.wait(5)
+    for char in "abc":
+        dispatcher.dispatch(make_content("€" * 59 + char))
+    release.set()
+    dispatcher.stop()
+
+    assert received == ["x", "€" * 59 + "c"]
+
+
+def test_timeouts_are_counted():
+    dispatcher = ContentDispatcher()
+    dispatcher.add(lambda c: time.sleep(0.05), timeout=0.01)
+    dispatcher.dispatch(make_content("a"))
+
+    stats = list(dispatcher.stats().values())[0]
+    assert stats['timeouts'] == 1
+    assert stats['max_latency'] >= 0.05
+
+
+def test_stats_keep_bound_methods_of_different_instances_apart():
+    class Consumer:
+        def handle(self, content):
+            pass
+
+    dispatcher = ContentDispatcher()
+    first, second = Consumer(), Consumer()
+    dispatcher.add(first.handle)
+    dispatcher.add(second.handle)
+    dispatcher.add(first.handle)
+
+    assert len(dispatcher.stats()) == 2
+
+
+def test_remove_handler():
+    dispatcher = ContentDispatcher()
+    received = []
+    dispatcher.add(received.append, asynchronous=True)
+    dispatcher.remove(received.append)
+    dispatcher.dispatch(make_content("a"))
+
+    assert received == []
+    assert received.append not in dispatcher
+
+def test_drop_warnings_are_rate_limited(caplog):
+    dispatcher = ContentDispatcher()
+    release = threading.Event()
+    started = threading.Event()
+
+    def handler(content):
+        started.set()
+        release.wait(5)
+
+    dispatcher.add(handler, asynchronous=True, queue_size=1)
+    dispatcher.dispatch(make_content("first"))
+    assert started.wait(5)
+    with caplog.at_level("WARNING"):
+        for i in range(20):
+            dispatcher.dispatch(make_content(str(i)))
+    release.set()
+    dispatcher.stop()
+
+    assert len([r for r in caplog.records if "queue full" in r.message]) == 1
\ No newline at end of file
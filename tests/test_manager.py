@@ -0,0 +1,175 @@
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from clipkeeper.core.clipboard import ClipboardContent, ClipboardFormat
+from clipkeeper.core.manager import ClipboardManager, CHUNK_SIZE, CHUNK_THRESHOLD, PREVIEW_LENGTH
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "clipboard.db")
+
+
+@pytest.fixture
+def manager(db_path):
+    return ClipboardManager(db_path=db_path, clipboard=object())
+
+
+@pytest.fixture
+def big_text():
+    # Multi-byte characters make chunk boundaries fall inside characters
+    unit = "abc éè € "
+    text = unit * (CHUNK_THRESHOLD // len(unit) + 1000)
+    return text + "NEEDLE-AT-END"
+
+
+def save_big(manager, text):
+    manager._save_clipboard(text)
+    return manager.get_history(limit=1)[0]
+
+
+def chunk_count(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM clipboard_chunks").fetchone()[0]
+
+
+def test_migrates_old_schema(db_path):
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("""
+            CREATE TABLE clipboard_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                content TEXT NOT NULL,
+                content_type TEXT NOT NULL,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                hash TEXT UNIQUE NOT NULL
+            )
+        """)
+        conn.execute(
+            "INSERT INTO clipboard_history (content, content_type, hash) VALUES (?, 'text', 'h')",
+            ("héllo",)
+        )
+
+    manager = ClipboardManager(db_path=db_path, clipboard=object())
+    item = manager.get_history()[0]
+    assert item['size'] == 6
+    assert item['chunked'] is False
+    assert manager.read_item(item['id']) == "héllo".encode('utf-8')
+
+
+def test_hash_matches_previous_format(manager):
+    import hashlib
+    text = "x€" * 300000
+    assert manager._calculate_hash(text) == hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def test_filters(manager):
+    manager._save_clipboard("short", "text")
+    manager._save_clipboard("a much longer piece of text", "text")
+    manager._save_clipboard("aW1hZ2U=", "image")
+
+    assert [i['content'] for i in manager.get_history(content_type="image")] == ["aW1hZ2U="]
+    assert [i['content'] for i in manager.get_history(max_size=5)] == ["short"]
+    assert len(manager.get_history(min_size=6, content_type="text")) == 1
+
+    now = datetime.now(timezone.utc)
+    assert len(manager.get_history(since=now - timedelta(minutes=5))) == 3
+    assert manager.get_history(until=now - timedelta(minutes=5)) == []
+    assert len(manager.search_history("text", content_type="text")) == 1
+
+
+def test_small_item_range_reads(manager):
+    text = "héllo wörld"
+    manager._save_clipboard(text)
+    item_id = manager.get_history()[0]['id']
+    encoded = text.encode('utf-8')
+
+    assert manager.read_item(item_id) == encoded
+    assert manager.read_item(item_id, 1, 3) == encoded[1:4]
+    assert manager.read_item(item_id, len(encoded) + 10, 5) == b""
+    assert manager.read_item(999) is None
+    with pytest.raises(ValueError):
+        manager.read_item(item_id, -1)
+
+
+def test_chunked_storage(manager, db_path, big_text):
+    item = save_big(manager, big_text)
+    encoded = big_text.encode('utf-8')
+
+    assert item['chunked'] is True
+    assert item['size'] == len(encoded)
+    assert item['content'] == big_text[:PREVIEW_LENGTH]
+    assert chunk_count(db_path) == -(-len(encoded) // CHUNK_SIZE)
+    assert manager.read_item(item['id']) == encoded
+
+
+@pytest.mark.parametrize('offset, length', [
+    (0, 10),
+    (CHUNK_SIZE - 3, 10),
+    (CHUNK_SIZE, CHUNK_SIZE),
+    (CHUNK_SIZE * 2 - 1, CHUNK_SIZE * 2 + 2),
+    (123457, None),
+])
+def test_chunked_range_reads(manager, big_text, offset, length):
+    item = save_big(manager, big_text)
+    encoded = big_text.encode('utf-8')
+    end = None if length is None else offset + length
+
+    assert manager.read_item(item['id'], offset, length) == encoded[offset:end]
+
+
+def test_iter_item_streams_range(manager, big_text):
+    item = save_big(manager, big_text)
+    encoded = big_text.encode('utf-8')
+
+    pieces = list(manager.iter_item(item['id'], 7, 900000, chunk_size=100000))
+    assert all(len(piece) <= 100000 for piece in pieces)
+    assert b"".join(pieces) == encoded[7:900007]
+
+
+def test_chunked_deduplication(manager, db_path, big_text):
+    save_big(manager, big_text)
+    chunks = chunk_count(db_path)
+    manager._save_clipboard(big_text)
+
+    assert len(manager.get_history()) == 1
+    assert chunk_count(db_path) == chunks
+
+
+def test_chunks_removed_on_delete_and_clear(manager, db_path, big_text):
+    item = save_big(manager, big_text)
+    manager.delete_item(item['id'])
+    assert chunk_count(db_path) == 0
+
+    save_big(manager, big_text)
+    manager.clear_history()
+    assert chunk_count(db_path) == 0
+
+
+def test_search_matches_beyond_preview(manager, big_text):
+    item = save_big(manager, big_text)
+
+    results = manager.search_history("NEEDLE-AT-END")
+    assert [r['id'] for r in results] == [item['id']]
+    assert results[0]['chunked'] is True
+
+
+def test_search_matches_across_chunk_boundary(manager):
+    # "XYZZY" starts three bytes before the end of the first chunk
+    text = "a" * (CHUNK_SIZE - 3) + "XYZZY" + "b" * CHUNK_THRESHOLD
+    item = save_big(manager, text)
+
+    assert manager.read_item(item['id'], CHUNK_SIZE - 3, 5) == b"XYZZY"
+    assert [r['id'] for r in manager.search_history("XYZZY")] == [item['id']]
+    assert manager.search_history("XYZZYX") == []
+
+
+def test_handle_new_content_compares_by_hash(manager):
+    manager._handle_new_content(ClipboardContent("same", ClipboardFormat.TEXT, 0))
+    manager._handle_new_content(ClipboardContent("same", ClipboardFormat.TEXT, 0))
+    manager._handle_new_content(ClipboardContent("other", ClipboardFormat.TEXT, 0))
+
+    assert not hasattr(manager, '_last_content')
+    assert manager._last_hash == manager._calculate_hash("other")
+    assert len(manager.get_history()) == 2
\ No newline at end of file
@@ -0,0 +1,100 @@
+import pstats
+import sys
+import threading
+
+import pytest
+
+from clipkeeper.utils.profiler import Profiler
+
+# clipkeeper.utils re-exports the `profiler` instance under the module's name
+profiler_module = sys.modules[Profiler.__module__]
+
+
+def busy(n=20000):
+    return sum(i * i for i in range(n))
+
+
+def test_section_is_noop_when_off(tmp_path):
+    profiler = Profiler(output_dir=tmp_path)
+    with profiler.section('monitor'):
+        busy()
+
+    assert profiler.stop() == []
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize('duration', [0, -1])
+def test_start_rejects_non_positive_duration(tmp_path, duration):
+    profiler = Profiler(output_dir=tmp_path)
+    with pytest.raises(ValueError):
+        profiler.start(duration)
+    assert not profiler.active
+
+
+def test_concurrent_sections_are_dumped(tmp_path):
+    profiler = Profiler(output_dir=tmp_path)
+    assert profiler.start(30)
+    assert not profiler.start(30)
+
+    def work(label):
+        for _ in range(5):
+            with profiler.section(label):
+                busy()
+
+    threads = [threading.Thread(target=work, args=(label,)) for label in ('monitor', 'writer')]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    written = profiler.stop()
+
+    expected = {'monitor', 'writer'} if profiler_module.PER_THREAD_PROFILING else {'process'}
+    assert {path.stem.rsplit('-', 1)[1] for path in written} == expected
+    for path in written:
+        assert pstats.Stats(str(path)).total_calls > 0
+    assert not profiler.active
+
+
+def test_failed_enable_does_not_escape_section(tmp_path, monkeypatch):
+    profiler = Profiler(output_dir=tmp_path)
+    monkeypatch.setattr(profiler_module, 'PER_THREAD_PROFILING', True)
+    assert profiler.start(30)
+
+    class Broken:
+        def enable(self):
+            raise ValueError("Another profiling tool is already active")
+
+        def disable(self):
+            pass
+
+    monkeypatch.setattr(profiler_module.cProfile, 'Profile', Broken)
+    with profiler.section('monitor'):
+        busy()
+    profiler._profiles.clear()
+
+    assert profiler.stop() == []
+
+@pytest.mark.skipif(not profiler_module.PER_THREAD_PROFILING,
+                    reason="sections are not recorded separately on Python 3.12+")
+def test_nested_writer_section_gets_its_own_profile(tmp_path, monkeypatch):
+    from clipkeeper.core.manager import ClipboardManager
+
+    manager = ClipboardManager(db_path=str(tmp_path / "clipboard.db"), clipboard=object())
+    profiler = profiler_module.profiler
+    monkeypatch.setattr(profiler, 'output_dir', tmp_path / "profiles")
+    assert profiler.start(30)
+    try:
+        with profiler.section('monitor'):
+            busy()
+            manager._save_clipboard("profiled text")
+            busy()
+    finally:
+        written = profiler.stop()
+
+    by_label = {path.stem.rsplit('-', 1)[1]: path for path in written}
+    assert set(by_label) == {'monitor', 'writer'}
+    writer_funcs = {func[2] for func in pstats.Stats(str(by_label['writer'])).stats}
+    monitor_funcs = {func[2] for func in pstats.Stats(str(by_label['monitor'])).stats}
+    # The database write is recorded under writer, not the enclosing monitor section
+    assert any('execute' in name for name in writer_funcs)
+    assert not any('execute' in name for name in monitor_funcs)
\ No newline at end of file
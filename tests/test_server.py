@@ -0,0 +1,59 @@
+import pytest
+
+from clipkeeper import ClipboardManager, WebInterface
+
+
+@pytest.fixture
+def client(tmp_path):
+    manager = ClipboardManager(db_path=str(tmp_path / "clipboard.db"), clipboard=object())
+    for i in range(600):
+        manager._save_clipboard(f"item {i}")
+    return WebInterface(manager).app.test_client()
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('', 50),
+    ('limit=-1', 1),
+    ('limit=0', 1),
+    ('limit=100000', 500),
+    ('offset=-5', 50),
+    ('offset=590', 10),
+])
+def test_history_limit_and_offset_are_clamped(client, query, expected):
+    response = client.get(f'/api/history?{query}')
+    assert response.status_code == 200
+    assert len(response.json) == expected
+
+
+@pytest.mark.parametrize('query', [
+    'min_size=abc',
+    'max_size=1.5',
+    'limit=x',
+    'offset=y',
+    'since=not-a-date',
+])
+def test_history_rejects_invalid_filters(client, query):
+    response = client.get(f'/api/history?{query}')
+    assert response.status_code == 400
+    assert 'error' in response.json
+
+
+def test_search_pages_with_offset(client):
+    # "item 1", "item 10".."item 19" and "item 100".."item 199" match
+    first = client.get('/api/history?search=item 1&limit=100')
+    second = client.get('/api/history?search=item 1&limit=100&offset=100')
+    assert first.status_code == second.status_code == 200
+    assert len(first.json) == 100
+    assert len(second.json) == 11
+    assert not {i['id'] for i in first.json} & {i['id'] for i in second.json}
+
+
+def test_history_filters_by_size(client):
+    response = client.get('/api/history?max_size=6&limit=500')
+    assert response.status_code == 200
+    assert {item['content'] for item in response.json} == {f"item {i}" for i in range(10)}
+
+@pytest.mark.parametrize('body', [[1], "text", 5])
+def test_profile_rejects_non_object_body(client, body):
+    response = client.post('/api/profile', json=body)
+    assert response.status_code == 400
\ No newline at end of file